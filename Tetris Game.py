@@ -1,16 +1,24 @@
 # Joseph Vusumzi Duda
 
+import time
+
+_PROCESS_START = time.perf_counter()
+
+import argparse
+import os
 import random
 import sys
 from enum import Enum
-from typing import List, Tuple, Optional
+from typing import Callable, Dict, List, NamedTuple, Tuple, Optional
 
-from PyQt5.QtCore import Qt, QBasicTimer, pyqtSignal, QSettings
+from PyQt5.QtCore import Qt, QBasicTimer, QThread, pyqtSignal, QSettings
 from PyQt5.QtGui import QPainter, QColor, QFont, QPixmap
-from PyQt5.QtWidgets import (QMainWindow, QFrame, QDesktopWidget, QApplication, 
+from PyQt5.QtWidgets import (QMainWindow, QFrame, QApplication, 
                              QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
                              QWidget, QMessageBox, QMenuBar, QAction)
 
+_IMPORTS_DONE = time.perf_counter()
+
 
 class TetrominoType(Enum):
     """Enum for tetromino types"""
@@ -32,17 +40,52 @@ class GameState(Enum):
     GAME_OVER = 3
 
 
+class StartupProfiler:
+    """Collects startup timings reported by --startup-profile"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.marks: List[Tuple[str, float]] = [("process start", _PROCESS_START),
+                                               ("imports", _IMPORTS_DONE)]
+
+    def mark(self, name: str, stamp: Optional[float] = None):
+        """Record the end of a startup phase, now unless a timestamp is given"""
+        if self.enabled:
+            self.marks.append((name, time.perf_counter() if stamp is None else stamp))
+
+    def elapsed(self, name: str) -> Optional[float]:
+        """Get milliseconds from process start to the named mark"""
+        for mark_name, stamp in self.marks:
+            if mark_name == name:
+                return (stamp - _PROCESS_START) * 1000
+        return None
+
+    def report(self) -> str:
+        """Format the recorded phases as a table"""
+        lines = ["Startup profile (ms)      phase    total"]
+        for (_, prev), (name, stamp) in zip(self.marks, self.marks[1:]):
+            lines.append(f"  {name:<20}{(stamp - prev) * 1000:9.1f}"
+                         f"{(stamp - _PROCESS_START) * 1000:9.1f}")
+        first_paint = self.elapsed("first paint")
+        if first_paint is not None:
+            lines.append(f"  time to first paint: {first_paint:.1f} ms")
+        return "\n".join(lines)
+
+
 class Tetris(QMainWindow):
     """Main Tetris game window"""
     
-    def __init__(self):
+    startup_finished = pyqtSignal()
+    
+    def __init__(self, profiler: Optional[StartupProfiler] = None):
         super().__init__()
-        self.settings = QSettings('TetrisGame', 'Tetris')
+        self.profiler = profiler or StartupProfiler()
+        self.settings = None
+        self.is_ui_complete = False
         self.init_ui()
-        self.load_settings()
 
     def init_ui(self):
-        """Initialize the user interface"""
+        """Initialize the parts of the user interface needed for the first frame"""
         self.setWindowTitle('Enhanced Tetris')
         self.setFixedSize(700, 600)
         self.center_window()
@@ -56,12 +99,13 @@ class Tetris(QMainWindow):
         self.board = Board(self)
         main_layout.addWidget(self.board)
         
-        # Create side panel
-        side_panel = self.create_side_panel()
-        main_layout.addWidget(side_panel)
+        # Reserve space for the side panel, filled in after the first paint
+        self.side_panel = QWidget()
+        self.side_panel.setFixedWidth(200)
+        main_layout.addWidget(self.side_panel)
         
-        # Create menu bar
-        self.create_menu_bar()
+        # Reserve the menu bar height, actions are added after the first paint
+        self.game_menu = self.menuBar().addMenu('Game')
         
         # Create status bar
         self.statusbar = self.statusBar()
@@ -72,13 +116,32 @@ class Tetris(QMainWindow):
         self.board.level_changed.connect(self.update_level)
         self.board.lines_changed.connect(self.update_lines)
         self.board.next_piece_changed.connect(self.update_next_piece)
+        self.board.first_painted.connect(self.on_first_paint, Qt.QueuedConnection)
         
+        self.profiler.mark("window construction")
         self.show()
 
-    def create_side_panel(self) -> QWidget:
-        """Create the side panel with game info"""
-        panel = QWidget()
-        panel.setFixedWidth(200)
+    def on_first_paint(self, painted_at: float):
+        """Finish startup once the board has been drawn"""
+        self.profiler.mark("first paint", painted_at)
+        self.finish_startup()
+
+    def finish_startup(self):
+        """Build the widgets and settings deferred until after the first paint"""
+        if self.is_ui_complete:
+            return
+        
+        self.create_side_panel(self.side_panel)
+        self.create_menu_bar()
+        self.settings = QSettings('TetrisGame', 'Tetris')
+        self.load_settings()
+        
+        self.is_ui_complete = True
+        self.profiler.mark("deferred ui")
+        self.startup_finished.emit()
+
+    def create_side_panel(self, panel: QWidget):
+        """Fill the side panel with game info"""
         layout = QVBoxLayout(panel)
         
         # Game statistics
@@ -144,6 +207,7 @@ class Tetris(QMainWindow):
         ↓ : Rotate Right
         Space : Drop
         P : Pause
+        H : Hint
         """
         controls_label = QLabel(controls_text)
         controls_label.setFont(QFont("Arial", 8))
@@ -151,15 +215,10 @@ class Tetris(QMainWindow):
         
         layout.addWidget(controls_frame)
         layout.addStretch()
-        
-        return panel
 
     def create_menu_bar(self):
-        """Create the menu bar"""
-        menubar = self.menuBar()
-        
-        # Game menu
-        game_menu = menubar.addMenu('Game')
+        """Fill the menu bar"""
+        game_menu = self.game_menu
         
         new_game_action = QAction('New Game', self)
         new_game_action.setShortcut('Ctrl+N')
@@ -168,6 +227,14 @@ class Tetris(QMainWindow):
         
         game_menu.addSeparator()
         
+        self.hint_action = QAction('Show Hint', self)
+        self.hint_action.setShortcut('H')
+        self.hint_action.setCheckable(True)
+        self.hint_action.toggled.connect(self.board.set_hint_enabled)
+        game_menu.addAction(self.hint_action)
+        
+        game_menu.addSeparator()
+        
         exit_action = QAction('Exit', self)
         exit_action.setShortcut('Ctrl+Q')
         exit_action.triggered.connect(self.close)
@@ -177,12 +244,11 @@ class Tetris(QMainWindow):
 
     def center_window(self):
         """Center the window on screen"""
-        screen = QDesktopWidget().screenGeometry()
-        size = self.geometry()
-        self.move(
-            (screen.width() - size.width()) // 2,
-            (screen.height() - size.height()) // 2
-        )
+        primary = QApplication.primaryScreen()
+        if primary is None:
+            return
+        screen = primary.availableGeometry()
+        self.move(screen.center() - self.rect().center())
 
     def start_game(self):
         """Start a new game"""
@@ -219,17 +285,18 @@ class Tetris(QMainWindow):
 
     def load_settings(self):
         """Load game settings"""
-        # Could load high scores, preferences, etc.
-        pass
+        self.hint_action.setChecked(self.settings.value('show_hint', False, type=bool))
 
     def save_settings(self):
         """Save game settings"""
-        # Could save high scores, preferences, etc.
-        pass
+        if self.settings is None:
+            return
+        self.settings.setValue('show_hint', self.board.show_hint)
 
     def closeEvent(self, event):
         """Handle window close event"""
         self.save_settings()
+        self.board.stop_hints()
         event.accept()
 
 
@@ -297,10 +364,12 @@ class Board(QFrame):
     level_changed = pyqtSignal(int)
     lines_changed = pyqtSignal(int)
     next_piece_changed = pyqtSignal(TetrominoType)
+    first_painted = pyqtSignal(float)
     
     BOARD_WIDTH = 10
     BOARD_HEIGHT = 22
     INITIAL_SPEED = 500
+    HINT_DEPTH = 2
     
     def __init__(self, parent):
         super().__init__(parent)
@@ -323,6 +392,11 @@ class Board(QFrame):
         self.setFocusPolicy(Qt.StrongFocus)
         self.is_started = False
         self.is_paused = False
+        self.has_painted = False
+        self.show_hint = False
+        self.hint = None
+        self.hint_generation = 0
+        self.hint_workers = []
         self.clear_board()
         
         # Generate first next piece
@@ -402,6 +476,14 @@ class Board(QFrame):
                                    board_top + i * self.square_height(),
                                    shape)
 
+        # Draw hint overlay
+        if (self.show_hint and self.hint is not None and
+                self.hint.piece_type == self.cur_piece.shape()):
+            for x, y in self.hint.cells:
+                self.draw_hint_square(painter,
+                                      rect.left() + x * self.square_width(),
+                                      board_top + (Board.BOARD_HEIGHT - y - 1) * self.square_height())
+
         # Draw current piece
         if self.cur_piece.shape() != TetrominoType.NO_SHAPE:
             for i in range(4):
@@ -419,6 +501,10 @@ class Board(QFrame):
             painter.setFont(QFont("Arial", 24, QFont.Bold))
             painter.drawText(rect, Qt.AlignCenter, "PAUSED")
 
+        if not self.has_painted:
+            self.has_painted = True
+            self.first_painted.emit(time.perf_counter())
+
     def keyPressEvent(self, event):
         """Handle key press events"""
         if not self.is_started or self.cur_piece.shape() == TetrominoType.NO_SHAPE:
@@ -541,6 +627,57 @@ class Board(QFrame):
             self.game_state = GameState.GAME_OVER
             self.msg_to_statusbar.emit("Game Over")
 
+        self.request_hint()
+
+    def set_hint_enabled(self, enabled: bool):
+        """Turn the hint overlay on or off"""
+        self.show_hint = enabled
+        if enabled:
+            self.request_hint()
+        else:
+            self.cancel_hint()
+        self.update()
+
+    def request_hint(self):
+        """Start a background search for the current piece, replacing any running one"""
+        self.cancel_hint()
+        if not self.show_hint or self.cur_piece.shape() == TetrominoType.NO_SHAPE:
+            return
+
+        search = HintSearch(self.board, [self.cur_piece.shape(), self.next_piece.shape()])
+        worker = HintWorker(self.hint_generation, search, Board.HINT_DEPTH,
+                            self.get_speed(), self)
+        worker.hint_ready.connect(self.on_hint_ready)
+        worker.finished.connect(lambda: self.on_hint_worker_finished(worker))
+        self.hint_workers.append(worker)
+        worker.start(QThread.LowPriority)
+
+    def cancel_hint(self):
+        """Drop the current hint and interrupt running searches"""
+        self.hint_generation += 1
+        self.hint = None
+        for worker in self.hint_workers:
+            worker.requestInterruption()
+
+    def stop_hints(self):
+        """Interrupt running searches and wait for their threads to exit"""
+        self.cancel_hint()
+        for worker in list(self.hint_workers):
+            worker.wait()
+
+    def on_hint_ready(self, generation: int, hint: 'Hint'):
+        """Show a search result if it is for the current piece"""
+        if generation != self.hint_generation:
+            return
+        self.hint = hint
+        self.update()
+
+    def on_hint_worker_finished(self, worker: 'HintWorker'):
+        """Release a finished search thread"""
+        if worker in self.hint_workers:
+            self.hint_workers.remove(worker)
+            worker.deleteLater()
+
     def try_move(self, new_piece: 'Shape', new_x: int, new_y: int) -> bool:
         """Try to move a piece"""
         for i in range(4):
@@ -591,6 +728,14 @@ class Board(QFrame):
                         y + self.square_height() - 1, 
                         x + self.square_width() - 1, y + 1)
 
+    def draw_hint_square(self, painter: QPainter, x: int, y: int):
+        """Draw a single translucent hint square"""
+        painter.fillRect(x + 1, y + 1,
+                        self.square_width() - 2,
+                        self.square_height() - 2, QColor(255, 255, 255, 50))
+        painter.setPen(QColor(255, 255, 255, 160))
+        painter.drawRect(x + 1, y + 1, self.square_width() - 3, self.square_height() - 3)
+
     def emit_signals(self):
         """Emit status signals"""
         self.score_changed.emit(self.score)
@@ -689,13 +834,533 @@ class Shape:
         return result
 
 
+class Hint(NamedTuple):
+    """Best placement found for a piece"""
+    piece_type: TetrominoType
+    cells: Tuple[Tuple[int, int], ...]
+    score: float
+
+
+class SearchInterrupted(Exception):
+    """Raised when a hint search is cancelled or runs out of time"""
+
+
+class HintSearch:
+    """Placement search over a snapshot of the board cells"""
+    
+    HEIGHT_WEIGHT = -0.51
+    LINES_WEIGHT = 0.76
+    HOLES_WEIGHT = -0.36
+    BUMPINESS_WEIGHT = -0.18
+    GAME_OVER_SCORE = -1000.0
+    
+    ORIENTATIONS = {}
+
+    def __init__(self, cells: List[TetrominoType], pieces: List[TetrominoType]):
+        self.cells = list(cells)
+        self.pieces = list(pieces)
+        self.should_stop: Callable[[], bool] = lambda: False
+
+    @staticmethod
+    def orientations(piece_type: TetrominoType) -> List[Tuple[int, Tuple[Tuple[int, int], ...]]]:
+        """Get the distinct orientations of a piece with the left rotations reaching them"""
+        if piece_type not in HintSearch.ORIENTATIONS:
+            shape = Shape()
+            shape.set_shape(piece_type)
+            result = []
+            seen = set()
+            for rotations in range(4):
+                min_x, min_y = shape.min_x(), shape.min_y()
+                key = frozenset((x - min_x, y - min_y) for x, y in shape.coords)
+                if key not in seen:
+                    seen.add(key)
+                    result.append((rotations, tuple((x, y) for x, y in shape.coords)))
+                shape = shape.rotate_left()
+            HintSearch.ORIENTATIONS[piece_type] = result
+        return HintSearch.ORIENTATIONS[piece_type]
+
+    @staticmethod
+    def fits(cells: List[TetrominoType], coords, x: int, y: int) -> bool:
+        """Check whether a piece fits at a board position"""
+        for cx, cy in coords:
+            bx = x + cx
+            by = y - cy
+            if bx < 0 or bx >= Board.BOARD_WIDTH or by < 0 or by >= Board.BOARD_HEIGHT:
+                return False
+            if cells[by * Board.BOARD_WIDTH + bx] != TetrominoType.NO_SHAPE:
+                return False
+        return True
+
+    def placements(self, cells: List[TetrominoType], piece_type: TetrominoType):
+        """Yield the cells of every hard-drop landing of a piece"""
+        for _, coords in HintSearch.orientations(piece_type):
+            xs = [cx for cx, _ in coords]
+            top_y = Board.BOARD_HEIGHT - 1 + min(cy for _, cy in coords)
+            for x in range(-min(xs), Board.BOARD_WIDTH - max(xs)):
+                if not HintSearch.fits(cells, coords, x, top_y):
+                    continue
+                y = top_y
+                while HintSearch.fits(cells, coords, x, y - 1):
+                    y -= 1
+                yield tuple((x + cx, y - cy) for cx, cy in coords)
+
+    @staticmethod
+    def place(cells: List[TetrominoType], piece_type: TetrominoType,
+              placed) -> Tuple[List[TetrominoType], int]:
+        """Lock a piece into a copy of the cells and remove full lines"""
+        width = Board.BOARD_WIDTH
+        result = list(cells)
+        for x, y in placed:
+            result[y * width + x] = piece_type
+
+        rows = [result[row * width:(row + 1) * width] for row in range(Board.BOARD_HEIGHT)]
+        kept = [row for row in rows if TetrominoType.NO_SHAPE in row]
+        lines = Board.BOARD_HEIGHT - len(kept)
+        if lines:
+            result = [cell for row in kept for cell in row]
+            result += [TetrominoType.NO_SHAPE] * (lines * width)
+        return result, lines
+
+    @staticmethod
+    def evaluate(cells: List[TetrominoType]) -> float:
+        """Score a board by height, holes and bumpiness"""
+        width = Board.BOARD_WIDTH
+        heights = []
+        holes = 0
+        for col in range(width):
+            height = 0
+            for row in range(Board.BOARD_HEIGHT - 1, -1, -1):
+                if cells[row * width + col] != TetrominoType.NO_SHAPE:
+                    if not height:
+                        height = row + 1
+                elif height:
+                    holes += 1
+            heights.append(height)
+
+        bumpiness = sum(abs(a - b) for a, b in zip(heights, heights[1:]))
+        return (HintSearch.HEIGHT_WEIGHT * sum(heights) +
+                HintSearch.HOLES_WEIGHT * holes +
+                HintSearch.BUMPINESS_WEIGHT * bumpiness)
+
+    def value(self, cells: List[TetrominoType], index: int, depth: int) -> float:
+        """Get the best score of a board with pieces index..depth still to place"""
+        if self.should_stop():
+            raise SearchInterrupted()
+        if index >= depth:
+            return HintSearch.evaluate(cells)
+
+        piece_type = self.pieces[index]
+        best = HintSearch.GAME_OVER_SCORE
+        for placed in self.placements(cells, piece_type):
+            result, lines = HintSearch.place(cells, piece_type, placed)
+            score = HintSearch.LINES_WEIGHT * lines + self.value(result, index + 1, depth)
+            best = max(best, score)
+        return best
+
+    def best_placement(self, depth: int,
+                       should_stop: Optional[Callable[[], bool]] = None) -> Optional[Hint]:
+        """Find the best placement of the first piece looking depth known pieces ahead"""
+        self.should_stop = should_stop or (lambda: False)
+        depth = min(depth, len(self.pieces))
+        piece_type = self.pieces[0]
+        best = None
+        for placed in self.placements(self.cells, piece_type):
+            result, lines = HintSearch.place(self.cells, piece_type, placed)
+            score = HintSearch.LINES_WEIGHT * lines + self.value(result, 1, depth)
+            if best is None or score > best.score:
+                best = Hint(piece_type, placed, score)
+        return best
+
+
+class HintWorker(QThread):
+    """Runs a HintSearch off the GUI thread, deepening until the deadline"""
+    
+    hint_ready = pyqtSignal(int, object)
+
+    def __init__(self, generation: int, search: HintSearch, max_depth: int,
+                 deadline_ms: int, parent=None):
+        super().__init__(parent)
+        self.generation = generation
+        self.search = search
+        self.max_depth = max_depth
+        self.deadline_ms = deadline_ms
+
+    def run(self):
+        """Emit the result of each completed depth until cancelled or out of time"""
+        deadline = time.perf_counter() + self.deadline_ms / 1000
+
+        def should_stop() -> bool:
+            return self.isInterruptionRequested() or time.perf_counter() > deadline
+
+        for depth in range(1, min(self.max_depth, len(self.search.pieces)) + 1):
+            try:
+                hint = self.search.best_placement(depth, should_stop)
+            except SearchInterrupted:
+                return
+            if hint is None:
+                return
+            self.hint_ready.emit(self.generation, hint)
+
+
+class SoakSample(NamedTuple):
+    """Memory usage recorded during a soak run"""
+    pieces: int
+    traced_bytes: int
+    blocks: int
+    rss_kb: Optional[int]
+
+
+class SoakTest:
+    """Drives a Board with a greedy bot for a long run and tracks memory growth"""
+    
+    PAINT_EVERY = 100
+    TOP_LINES = 10
+    # Enough to see through one helper such as a namedtuple constructor; every
+    # extra frame makes each traced allocation noticeably slower
+    TRACE_FRAMES = 2
+    LANDING_WEIGHT = -0.3
+    
+    PROFILES = {}
+
+    def __init__(self, pieces: int, interval: int, warmup: int,
+                 max_growth_kb: float, max_blocks_per_piece: float):
+        self.total_pieces = pieces
+        self.interval = interval
+        self.warmup = warmup
+        self.max_growth_kb = max_growth_kb
+        self.max_blocks_per_piece = max_blocks_per_piece
+        
+        self.board = Board(None)
+        self.board.resize(250, 550)
+        self.pieces = 0
+        self.games = 0
+        self.samples: List[SoakSample] = []
+        self.baseline: Optional[SoakSample] = None
+        self.baseline_lines: Dict[Tuple[str, int], Tuple[int, int]] = {}
+        self.last_lines: Dict[Tuple[str, int], Tuple[int, int]] = {}
+        self.elapsed = 0.0
+        self.subsystems: Dict[Tuple[str, int], str] = {}
+        self.heights = [0] * Board.BOARD_WIDTH
+        
+        # Soak-only modules are imported here to keep them off the normal startup path
+        import ast
+        self.source_file = os.path.abspath(__file__)
+        with open(self.source_file, encoding='utf-8') as source:
+            tree = ast.parse(source.read())
+        self.spans = [(node.lineno, node.end_lineno, node.name) for node in tree.body
+                      if isinstance(node, (ast.ClassDef, ast.FunctionDef))]
+
+    @staticmethod
+    def current_rss_kb() -> Optional[int]:
+        """Get the resident set size of this process, if the platform exposes it"""
+        try:
+            with open('/proc/self/statm') as statm:
+                return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    def subsystem(self, filename: str, lineno: int) -> str:
+        """Get the top-level class or function owning a source line"""
+        key = (filename, lineno)
+        if key not in self.subsystems:
+            name = "module"
+            if os.path.abspath(filename) != self.source_file:
+                name = os.path.basename(filename)
+            else:
+                for start, end, span_name in self.spans:
+                    if start <= lineno <= end:
+                        name = span_name
+                        break
+            self.subsystems[key] = name
+        return self.subsystems[key]
+
+    @staticmethod
+    def profiles(piece_type: TetrominoType) -> List[Tuple[int, int, int, int, int, int, Tuple]]:
+        """Get the column profile of each orientation of a piece
+
+        Each entry is (rotations, left, right, top, sum of lowest cy, sum of highest cy,
+        columns) where columns holds (cx, highest cy) for every covered column.
+        """
+        if piece_type not in SoakTest.PROFILES:
+            result = []
+            for rotations, coords in HintSearch.orientations(piece_type):
+                lows = {}
+                highs = {}
+                for cx, cy in coords:
+                    lows[cx] = min(lows.get(cx, cy), cy)
+                    highs[cx] = max(highs.get(cx, cy), cy)
+                columns = tuple(sorted(highs.items()))
+                result.append((rotations, columns[0][0], columns[-1][0], min(lows.values()),
+                               sum(lows.values()), sum(highs.values()), columns))
+            SoakTest.PROFILES[piece_type] = result
+        return SoakTest.PROFILES[piece_type]
+
+    def choose_move(self) -> Optional[Tuple[int, int]]:
+        """Pick (rotations, x) for the current piece from column heights alone
+
+        The bot runs inside the traced region, where every Python allocation is
+        expensive, so each placement is scored in a single pass over the piece's
+        columns using precomputed profile sums.
+        """
+        board = self.board
+        width = Board.BOARD_WIDTH
+        heights = self.heights
+        holes = 0
+        for col in range(width):
+            heights[col] = 0
+            for row in range(Board.BOARD_HEIGHT - 1, -1, -1):
+                if board.board[row * width + col] != TetrominoType.NO_SHAPE:
+                    if not heights[col]:
+                        heights[col] = row + 1
+                elif heights[col]:
+                    holes += 1
+
+        best = None
+        best_score = 0.0
+        for rotations, left, right, top, low_sum, high_sum, columns in SoakTest.profiles(
+                board.cur_piece.shape()):
+            count = len(columns)
+            for x in range(-left, width - right):
+                # Hard drop lands where the first column touches the stack
+                y = 0
+                covered = 0
+                for cx, high in columns:
+                    covered += heights[x + cx]
+                    if heights[x + cx] + high > y:
+                        y = heights[x + cx] + high
+                if y - top >= Board.BOARD_HEIGHT:
+                    continue
+
+                new_holes = holes + count * y - high_sum - covered
+                height_gain = count * (y + 1) - low_sum - covered
+                score = (HintSearch.HEIGHT_WEIGHT * height_gain +
+                         HintSearch.HOLES_WEIGHT * new_holes +
+                         SoakTest.LANDING_WEIGHT * y)
+                if best is None or score > best_score:
+                    best = (rotations, x)
+                    best_score = score
+        return best
+
+    def play_piece(self):
+        """Place one piece where the bot puts it"""
+        board = self.board
+        if not board.is_started:
+            self.games += 1
+            board.start()
+        elif board.is_waiting_after_line:
+            board.is_waiting_after_line = False
+            board.new_piece()
+        
+        if board.cur_piece.shape() == TetrominoType.NO_SHAPE:
+            return
+        
+        move = self.choose_move()
+        if move is not None:
+            rotations, target_x = move
+            # Let gravity bring the piece clear of the top edge before turning it
+            for _ in range(2):
+                board.try_move(board.cur_piece, board.cur_x, board.cur_y - 1)
+            for _ in range(rotations):
+                board.try_move(board.cur_piece.rotate_left(), board.cur_x, board.cur_y)
+            step = 1 if target_x > board.cur_x else -1
+            while (board.cur_x != target_x and
+                   board.try_move(board.cur_piece, board.cur_x + step, board.cur_y)):
+                pass
+        
+        board.drop_down()
+        self.pieces += 1
+
+    def line_stats(self) -> Dict[Tuple[str, int], Tuple[int, int]]:
+        """Get live (size, count) per source line, excluding the soak harness itself
+
+        Each trace is charged to its most recent frame in this file, so objects
+        built by helpers such as namedtuple constructors count against the game
+        code that asked for them, and everything the harness keeps is dropped.
+        """
+        import gc
+        import tracemalloc
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [tracemalloc.Filter(False, tracemalloc.__file__, all_frames=True)])
+        stats = {}
+        for stat in snapshot.statistics('traceback'):
+            owner = stat.traceback[-1]
+            for frame in reversed(stat.traceback):
+                if os.path.abspath(frame.filename) == self.source_file:
+                    owner = frame
+                    break
+            if self.subsystem(owner.filename, owner.lineno) == SoakTest.__name__:
+                continue
+            key = (owner.filename, owner.lineno)
+            size, count = stats.get(key, (0, 0))
+            stats[key] = (size + stat.size, count + stat.count)
+        return stats
+
+    def take_sample(self):
+        """Record memory usage at the current piece count"""
+        lines = self.line_stats()
+        sample = SoakSample(self.pieces,
+                            sum(size for size, _ in lines.values()),
+                            sum(count for _, count in lines.values()),
+                            SoakTest.current_rss_kb())
+        self.samples.append(sample)
+        self.last_lines = lines
+        if self.baseline is None and self.pieces >= self.warmup:
+            self.baseline = sample
+            self.baseline_lines = lines
+        
+        rss = "-" if sample.rss_kb is None else sample.rss_kb
+        print(f"  {sample.pieces:>10}{sample.traced_bytes / 1024:12.1f}"
+              f"{sample.blocks:10}{rss:>10}", flush=True)
+
+    def run(self) -> bool:
+        """Play the configured number of pieces and check the memory budgets"""
+        print(f"{'pieces':>12}{'traced KB':>12}{'blocks':>10}{'RSS KB':>10}", flush=True)
+        import tracemalloc
+        random.seed(0)
+        tracemalloc.start(SoakTest.TRACE_FRAMES)
+        # Prime the lazy imports and caches used by the snapshot code itself
+        self.line_stats()
+        started = time.perf_counter()
+        next_sample = min(self.interval, self.warmup)
+        try:
+            while self.pieces < self.total_pieces:
+                self.play_piece()
+                if self.pieces % SoakTest.PAINT_EVERY == 0:
+                    self.board.grab()
+                if self.pieces >= next_sample:
+                    self.take_sample()
+                    next_sample = self.pieces + self.interval
+            if self.samples[-1].pieces != self.pieces:
+                self.take_sample()
+        finally:
+            self.elapsed = time.perf_counter() - started
+            tracemalloc.stop()
+        return self.passed()
+
+    def growth_kb(self) -> float:
+        """Get traced memory growth since the end of warm-up"""
+        return (self.samples[-1].traced_bytes - self.baseline.traced_bytes) / 1024
+
+    def blocks_per_piece(self) -> float:
+        """Get live blocks gained per piece since the end of warm-up"""
+        pieces = self.samples[-1].pieces - self.baseline.pieces
+        return (self.samples[-1].blocks - self.baseline.blocks) / max(pieces, 1)
+
+    def trend(self) -> float:
+        """Get the least-squares slope of traced bytes per 1000 pieces after warm-up"""
+        steady = [sample for sample in self.samples if sample.pieces >= self.baseline.pieces]
+        if len(steady) < 2:
+            return 0.0
+        mean_x = sum(sample.pieces for sample in steady) / len(steady)
+        mean_y = sum(sample.traced_bytes for sample in steady) / len(steady)
+        covariance = sum((sample.pieces - mean_x) * (sample.traced_bytes - mean_y)
+                         for sample in steady)
+        variance = sum((sample.pieces - mean_x) ** 2 for sample in steady)
+        return covariance / variance * 1000 if variance else 0.0
+
+    def passed(self) -> bool:
+        """Check steady-state growth against the budgets"""
+        return (self.growth_kb() <= self.max_growth_kb and
+                self.blocks_per_piece() <= self.max_blocks_per_piece)
+
+    def report(self) -> str:
+        """Format hot spots, growth trends and budget results"""
+        last = self.samples[-1]
+        lines = [f"Soak test: {self.pieces} pieces, {self.games} games in {self.elapsed:.1f} s "
+                 f"({self.pieces / max(self.elapsed, 1e-9):.0f} pieces/s)"]
+        
+        # Live memory and growth since warm-up per subsystem
+        subsystems: Dict[str, List[int]] = {}
+        growth: List[Tuple[int, int, Tuple[str, int]]] = []
+        for key in set(self.last_lines) | set(self.baseline_lines):
+            size, count = self.last_lines.get(key, (0, 0))
+            base_size, base_count = self.baseline_lines.get(key, (0, 0))
+            totals = subsystems.setdefault(self.subsystem(*key), [0, 0, 0, 0])
+            totals[0] += size
+            totals[1] += count
+            totals[2] += size - base_size
+            totals[3] += count - base_count
+            if size != base_size or count != base_count:
+                growth.append((size - base_size, count - base_count, key))
+        
+        lines.append("Allocation hot spots by subsystem:")
+        lines.append(f"  {'subsystem':<20}{'live KB':>10}{'blocks':>10}"
+                     f"{'growth KB':>12}{'blocks':>10}")
+        for name, (size, count, size_diff, count_diff) in sorted(
+                subsystems.items(), key=lambda item: (item[1][2], item[1][0]), reverse=True):
+            lines.append(f"  {name:<20}{size / 1024:10.1f}{count:10}"
+                         f"{size_diff / 1024:+12.1f}{count_diff:+10}")
+        
+        if growth:
+            lines.append("Top growing lines:")
+            for size_diff, count_diff, (filename, lineno) in sorted(growth, reverse=True)[:SoakTest.TOP_LINES]:
+                lines.append(f"  {os.path.basename(filename)}:{lineno} "
+                             f"{size_diff / 1024:+.1f} KB {count_diff:+} blocks")
+        
+        if last.rss_kb is not None and self.baseline.rss_kb is not None:
+            lines.append(f"RSS growth since warm-up: {last.rss_kb - self.baseline.rss_kb:+} KB")
+        lines.append(f"Traced memory trend: {self.trend():+.1f} bytes per 1000 pieces")
+        
+        growth_kb = self.growth_kb()
+        blocks_per_piece = self.blocks_per_piece()
+        lines.append(f"Steady-state growth: {growth_kb:+.1f} KB (budget {self.max_growth_kb:.1f} KB) "
+                     f"{'OK' if growth_kb <= self.max_growth_kb else 'OVER'}")
+        lines.append(f"Blocks per piece: {blocks_per_piece:+.4f} "
+                     f"(budget {self.max_blocks_per_piece:.4f}) "
+                     f"{'OK' if blocks_per_piece <= self.max_blocks_per_piece else 'OVER'}")
+        lines.append("PASS" if self.passed() else "FAIL")
+        return "\n".join(lines)
+
+
+def parse_args(argv: List[str]) -> Tuple[argparse.Namespace, List[str]]:
+    """Split command line into game options and arguments left for Qt"""
+    parser = argparse.ArgumentParser(description="Enhanced Tetris")
+    parser.add_argument('--startup-profile', action='store_true',
+                        help="print startup timings after the first frame and exit")
+    parser.add_argument('--soak', type=int, metavar='PIECES',
+                        help="play PIECES pieces offscreen with a bot and check memory growth")
+    parser.add_argument('--soak-interval', type=int, default=1000, metavar='PIECES',
+                        help="pieces between memory samples (default: 1000)")
+    parser.add_argument('--soak-warmup', type=int, default=1000, metavar='PIECES',
+                        help="pieces played before the steady-state baseline (default: 1000)")
+    parser.add_argument('--soak-max-growth-kb', type=float, default=64.0, metavar='KB',
+                        help="steady-state traced memory growth budget (default: 64)")
+    parser.add_argument('--soak-max-blocks-per-piece', type=float, default=0.01, metavar='N',
+                        help="live allocation blocks gained per piece budget (default: 0.01)")
+    args, qt_args = parser.parse_known_args(argv[1:])
+    if args.soak is not None and not 0 <= args.soak_warmup < args.soak:
+        parser.error("--soak must be larger than --soak-warmup")
+    if args.soak_interval <= 0:
+        parser.error("--soak-interval must be positive")
+    return args, qt_args
+
+
 def main():
     """Main function"""
-    app = QApplication(sys.argv)
+    args, qt_args = parse_args(sys.argv)
+    if args.soak is not None:
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        app = QApplication(sys.argv[:1] + qt_args)
+        soak = SoakTest(args.soak, args.soak_interval, args.soak_warmup,
+                        args.soak_max_growth_kb, args.soak_max_blocks_per_piece)
+        passed = soak.run()
+        print(soak.report())
+        sys.exit(0 if passed else 1)
+    
+    profiler = StartupProfiler(args.startup_profile)
+    
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setApplicationName("Enhanced Tetris")
     app.setOrganizationName("TetrisGame")
+    profiler.mark("application")
     
-    tetris = Tetris()
+    tetris = Tetris(profiler)
+    if args.startup_profile:
+        def report_startup():
+            print(profiler.report(), file=sys.stderr)
+            app.quit()
+        tetris.startup_finished.connect(report_startup)
     sys.exit(app.exec_())
 
 